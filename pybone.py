@@ -1,11 +1,25 @@
-from enum import Enum
-from math import log2
-import networkx as nx
-from itertools import product
-from dataclasses import dataclass
+from enum import Enum, IntEnum
+from math import ceil, exp2, floor, frexp, isfinite, ldexp, log2
+import numpy as np
+from dataclasses import dataclass, field
+from functools import lru_cache
+from bisect import bisect_right
 import argparse
+import os
+
+if os.environ.get('PYBONE_NUMBA') == '1':
+    # compiling the path search only pays off for very long melodies,
+    # since importing numba and compiling cost far more than a typical search
+    from numba import njit
+else:
+    def njit(*args, **kwargs):
+        return lambda function: function
+
+class Note(IntEnum):
+    # keep printing as Note.C rather than the plain integer IntEnum uses
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
 
-class Note(Enum):
     C = 0
     Db = 1
     D = 2
@@ -35,18 +49,34 @@ SEMITONES_PER_OCTAVE = 12
 A440_NOTE = Note.A
 A440_OCTAVE = 4
 A440_HERTZ = 440
-A440_SEMITONES = A440_NOTE.value + SEMITONES_PER_OCTAVE * A440_OCTAVE
+A440_SEMITONES = A440_NOTE + SEMITONES_PER_OCTAVE * A440_OCTAVE
 SPEED_OF_SOUND_MPS = 343
+# frequency ratios within an octave of each semitone
+SEMITONE_RATIOS = [2 ** (n / SEMITONES_PER_OCTAVE) for n in range(SEMITONES_PER_OCTAVE)]
+# frequency ratios within an octave halfway between each semitone and the next
+SEMITONE_ROUNDING_THRESHOLDS = [2 ** ((n + 0.5) / SEMITONES_PER_OCTAVE) for n in range(SEMITONES_PER_OCTAVE)]
+
+def _check_hertz(hertz: float):
+    if not (hertz > 0 and isfinite(hertz)):
+        raise ValueError('frequency must be positive and finite: {}'.format(hertz))
+
+# shared pitches without offset, see Pitch.get
+_INTERNED_PITCHES = {}
 
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
 class Pitch:
-    def __init__(self, note: Note, octave: int, offset: float = 0, name: str = None):
-        self.note = note
-        self.octave = octave
-        self.offset = offset
-        if name:
-            self.name = name
-        else:
-            self.name = self.note.name
+    note: Note
+    octave: int
+    offset: float = 0
+    name: str = None
+    _semitones: float = field(init=False)
+    _hertz: float = field(init=False, default=None)
+
+    def __post_init__(self):
+        # pitches are shared through the lru caches and Pitch.get interning, so they are frozen after construction
+        if not self.name:
+            object.__setattr__(self, 'name', self.note.name)
+        object.__setattr__(self, '_semitones', self.note + self.octave * SEMITONES_PER_OCTAVE + self.offset - A440_SEMITONES)
 
     def __hash__(self):
         return hash((self.name, self.note, self.octave, self.offset))
@@ -69,24 +99,35 @@ class Pitch:
         return self.name + octave_text + offset_text
     
     def __eq__(self, other):
+        if self is other:
+            return True
         return self.note == other.note and self.octave == other.octave and self.offset == other.offset
 
+    @classmethod
+    def get(cls, note: Note, octave: int):
+        """
+        Returns the shared pitch without offset for a note and octave.
+        """
+        pitch = _INTERNED_PITCHES.get((note, octave))
+        if pitch is None:
+            pitch = _INTERNED_PITCHES[(note, octave)] = Pitch(note, octave)
+        return pitch
+    
     def get_semitones(self):
-        semitones = self.note.value + self.octave * SEMITONES_PER_OCTAVE + self.offset
-        return semitones - A440_SEMITONES
+        return self._semitones
     
     @classmethod
+    @lru_cache(maxsize=2048)
     def from_string(cls, string: str):
-        is_num = [c.isnumeric() for c in string]
-        num_index = is_num.index(True)
-        name = string[:num_index]
-
-        if hasattr(Note, name):
-            note = Note[name]
-        elif name in ENHARMONICS:
-            note = ENHARMONICS[name]
+        # note names are a letter, optionally followed by a sharp or a flat
+        if len(string) >= 2 and string[1] in 'b#':
+            name, octave_text = string[:2], string[2:]
+        else:
+            name, octave_text = string[:1], string[1:]
+
+        note = Note[name] if name in Note.__members__ else ENHARMONICS[name]
         
-        octave = int(string[num_index:])
+        octave = int(octave_text)
         if name == 'Cb':
             octave -= 1
         elif name == 'B#':
@@ -95,6 +136,7 @@ class Pitch:
         return Pitch(note, octave, name=name)
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def from_semitones(cls, semitones: float):
         note_semitones = semitones + A440_SEMITONES
         rounded_semitones = round(note_semitones)
@@ -102,38 +144,255 @@ class Pitch:
         note = Note(rounded_semitones % SEMITONES_PER_OCTAVE)
         octave = rounded_semitones // SEMITONES_PER_OCTAVE
         offset = note_semitones - rounded_semitones
+        if offset == 0:
+            return Pitch.get(note, octave)
         return Pitch(note, octave, offset)
     
     def get_hertz(self):
-        return A440_HERTZ * 2 ** (self.get_semitones() / SEMITONES_PER_OCTAVE)
+        if self._hertz is None:
+            if self.offset == 0:
+                # whole octaves are exact powers of two, so only the semitone within the octave needs a ratio
+                octaves, semitone = divmod(int(self._semitones), SEMITONES_PER_OCTAVE)
+                hertz = ldexp(A440_HERTZ * SEMITONE_RATIOS[semitone], octaves)
+            else:
+                hertz = A440_HERTZ * exp2(self._semitones / SEMITONES_PER_OCTAVE)
+            object.__setattr__(self, '_hertz', hertz)
+        return self._hertz
     
     @classmethod
-    def from_hertz(cls, hertz: float):
+    def semitones_array(cls, pitches: list['Pitch']):
+        """
+        Returns the semitones relative to A440 of every pitch in a sequence,
+        as a single array.
+        """
+        return np.fromiter((p._semitones for p in pitches), dtype=np.float64, count=len(pitches))
+    
+    @classmethod
+    def hertz_array(cls, semitones: np.ndarray):
+        """
+        Returns the frequencies of an array of semitones relative to A440.
+        """
+        return A440_HERTZ * np.exp2(np.asarray(semitones, dtype=np.float64) / SEMITONES_PER_OCTAVE)
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def from_hertz(cls, hertz: float, snap: bool = False):
+        """
+        Returns the pitch of a frequency. If snap is set, the pitch is rounded to the
+        nearest semitone without allocating the pitch with offset first.
+        """
+        _check_hertz(hertz)
+        if snap:
+            return Pitch.from_hertz_rounded(hertz)
         semitones = log2(hertz / A440_HERTZ) * SEMITONES_PER_OCTAVE
         return Pitch.from_semitones(semitones)
     
+    @classmethod
+    def from_hertz_rounded(cls, hertz: float):
+        """
+        Returns the pitch without offset nearest to a frequency, i.e. the same as
+        from_hertz(hertz).remove_offset(), reading the octave off the float exponent
+        instead of taking a logarithm.
+        """
+        _check_hertz(hertz)
+        mantissa, exponent = frexp(hertz / A440_HERTZ)
+        semitones = (exponent - 1) * SEMITONES_PER_OCTAVE + bisect_right(SEMITONE_ROUNDING_THRESHOLDS, 2 * mantissa)
+        return Pitch.from_semitones(semitones)
+    
     def remove_offset(self):
-        return Pitch(self.note, self.octave)
+        return Pitch.get(self.note, self.octave)
 
 
 TROMBONE_FUNDAMENTAL = Pitch(Note.Bb, 1)
 TROMBONE_SLIDE_LENGTH = 6.5
-POSITIONS = ['1st', '2nd', '3rd', '4th', '5th', '6th', '7th']
-START_NODE = 'START'
-END_NODE = 'END'
+MAX_PARTIAL = 32
+# semitones above the fundamental of each partial, i.e. 12 * log2(partial + 1)
+PARTIAL_SEMITONE_OFFSETS = SEMITONES_PER_OCTAVE * np.log2(np.arange(1, MAX_PARTIAL + 1))
+POSITIONS = ('1st', '2nd', '3rd', '4th', '5th', '6th', '7th')
+
+# costs that the path search between slide positions can minimize
+WEIGHT_SLIDE_MOVEMENT = 0
+WEIGHT_DIRECTION_CHANGES = 1
+WEIGHT_PARTIAL_CHANGES = 2
+WEIGHT_PARTIAL_REPEATS = 3
+
+@njit(cache=True)
+def _direction_change_weight(curr_position, curr_out, next_position, next_out):
+    if curr_position > next_position: # position moves in
+        if next_out:
+            return np.inf
+        return 1.0 if curr_out else 0.0 # change direction from out to in, or keep moving in
+    elif curr_position < next_position: # position moves out
+        if not next_out:
+            return np.inf
+        return 0.0 if curr_out else 1.0 # keep moving out, or change direction from in to out
+    else: # same position, does not change direction
+        return 0.0 if curr_out == next_out else np.inf
+
+@njit(cache=True)
+def _backtrack(costs, backpointers, counts):
+    num_pitches = len(counts)
+    path = np.zeros(num_pitches, dtype=np.int32)
+    for k in range(1, counts[num_pitches - 1]):
+        if costs[k] < costs[path[num_pitches - 1]]:
+            path[num_pitches - 1] = k
+    for i in range(num_pitches - 1, 0, -1):
+        path[i - 1] = backpointers[i, path[i]]
+    return path
+
+@njit(cache=True)
+def _partial_viterbi(partials, counts, penalize_repeats):
+    """
+    Specialization of _viterbi for partial changes (or repeats). A transition only costs
+    depending on whether the partial stays the same, so the cheapest way into each state
+    comes either from the state on the same partial or from the cheapest other state.
+    """
+    num_pitches, max_states = partials.shape
+    costs = np.zeros(max_states)
+    backpointers = np.zeros((num_pitches, max_states), dtype=np.int32)
+
+    for i in range(1, num_pitches):
+        curr_count = counts[i - 1]
+
+        # cheapest and second cheapest current states, the lowest index wins ties
+        best = 0
+        second = -1
+        for j in range(1, curr_count):
+            if costs[j] < costs[best]:
+                second = best
+                best = j
+            elif second == -1 or costs[j] < costs[second]:
+                second = j
+        
+        next_costs = np.full(max_states, np.inf)
+        for k in range(counts[i]):
+            # the partials of each pitch are consecutive, so the same partial is found by offset
+            same = partials[i, k] - partials[i - 1, 0]
+            if same < 0 or same >= curr_count:
+                same = -1
+            
+            if penalize_repeats:
+                other = second if best == same else best
+                cost = costs[other] if other != -1 else np.inf
+                if same != -1 and (costs[same] + 1 < cost or (costs[same] + 1 == cost and same < other)):
+                    other = same
+                    cost = costs[same] + 1
+            else:
+                other = best
+                cost = costs[best] + 1
+                if same != -1 and (costs[same] < cost or (costs[same] == cost and same < other)):
+                    other = same
+                    cost = costs[same]
+            
+            next_costs[k] = cost
+            backpointers[i, k] = other
+        costs = next_costs
+    
+    return _backtrack(costs, backpointers, counts)
+
+@njit(cache=True)
+def _viterbi(positions, partials, outs, counts, weight_kind):
+    """
+    Returns the index of the chosen state for each pitch along the cheapest path,
+    where row i of positions, partials and outs holds the counts[i] states of pitch i.
+    """
+    if weight_kind == WEIGHT_PARTIAL_CHANGES or weight_kind == WEIGHT_PARTIAL_REPEATS:
+        return _partial_viterbi(partials, counts, weight_kind == WEIGHT_PARTIAL_REPEATS)
+    
+    num_pitches, max_states = positions.shape
+    costs = np.zeros(max_states)
+    backpointers = np.zeros((num_pitches, max_states), dtype=np.int32)
+
+    if weight_kind == WEIGHT_SLIDE_MOVEMENT:
+        # one elementwise pass over every pair of states of every pair of adjacent pitches
+        curr_positions = positions[:-1].reshape(num_pitches - 1, max_states, 1)
+        next_positions = positions[1:].reshape(num_pitches - 1, 1, max_states)
+        distances = np.abs(curr_positions - next_positions)
+
+    for i in range(1, num_pitches):
+        next_costs = np.full(max_states, np.inf)
+        for k in range(counts[i]):
+            for j in range(counts[i - 1]):
+                if weight_kind == WEIGHT_SLIDE_MOVEMENT:
+                    weight = distances[i - 1, j, k]
+                else:
+                    weight = _direction_change_weight(positions[i - 1, j], outs[i - 1, j], positions[i, k], outs[i, k])
+                cost = costs[j] + weight
+                if cost < next_costs[k]:
+                    next_costs[k] = cost
+                    backpointers[i, k] = j
+        costs = next_costs
+    
+    return _backtrack(costs, backpointers, counts)
+
+@lru_cache(maxsize=4096)
+def _playable_positions_and_partials(fundamental_semitones, slide_length, semitones):
+    """
+    Returns the read-only arrays of positions and partials a pitch can be played in.
+    They only depend on these three numbers, so repeated pitches are cached.
+    """
+    # position = offset + 12 * log2(partial + 1), so the range of playable partials
+    # can be solved for directly, padded by one on each side to absorb rounding
+    offset = fundamental_semitones - semitones
+    lowest_partial = max(0, ceil(exp2((-0.5 - offset) / SEMITONES_PER_OCTAVE)) - 2)
+    highest_partial = floor(exp2((slide_length - offset) / SEMITONES_PER_OCTAVE))
+
+    candidate_partials = np.arange(lowest_partial, highest_partial + 1)
+    candidate_positions = offset + SEMITONES_PER_OCTAVE * np.log2(candidate_partials + 1)
+
+    # partials below -0.5 are too low to play the note yet (allowing flat notes in first position),
+    # partials beyond the slide length are too high to play the note
+    playable = (candidate_positions > -0.5) & (candidate_positions <= slide_length)
+    positions = candidate_positions[playable]
+    partials = candidate_partials[playable]
+    positions.flags.writeable = False
+    partials.flags.writeable = False
+    return positions, partials
+
 
 class Trombone:
+    _default_instance = None
+
     def __init__(self, fundamental: Pitch = TROMBONE_FUNDAMENTAL, slide_length: float = TROMBONE_SLIDE_LENGTH):
-        self.fundamental = fundamental
-        self.slide_length = slide_length
+        self._fundamental = fundamental
+        self._fund_semitones = fundamental.get_semitones()
+        self._first_position_partial_semitones = tuple((self._fund_semitones + PARTIAL_SEMITONE_OFFSETS).tolist())
+        self._slide_length = slide_length
+    
+    @classmethod
+    def default(cls):
+        """
+        Returns a shared tenor trombone, so callers reuse one instance and its precomputed partial semitones.
+        """
+        # look in this class only, so subclasses do not inherit the base class's instance
+        if cls.__dict__.get('_default_instance') is None:
+            cls._default_instance = cls()
+        return cls._default_instance
+    
+    @property
+    def fundamental(self):
+        return self._fundamental
+    
+    @property
+    def slide_length(self):
+        return self._slide_length
+    
+    @classmethod
+    def round_position(cls, position: float):
+        """
+        Returns the nearest whole position. Halves round up to the further position,
+        except past 7th position, since positions up to the slide length are playable.
+        """
+        # positions are never below -0.5, so this avoids the banker's rounding of round()
+        return min(floor(position + 0.5), len(POSITIONS) - 1)
     
     @classmethod
     def position_to_string(cls, position: float):
-        rounded_position = round(position)
+        rounded_position = Trombone.round_position(position)
         offset = position - rounded_position
-        offset_prefix = '+' if offset > 0 else ''
-        offset_text = '' if offset == 0 else '{0:.3g}'.format(offset)
-        return '{}{}{}'.format(POSITIONS[rounded_position], offset_prefix, offset_text)
+        if offset == 0:
+            return POSITIONS[rounded_position]
+        return '{}{:+.3g}'.format(POSITIONS[rounded_position], offset)
     
     def get_pitch(self, position: float, partial: int):
         """
@@ -141,36 +400,25 @@ class Trombone:
         Positions are 0-indexed, i.e. 0 is first position, 1 is second position, etc.
         Partials are 0-indexed from pedal, i.e. 0 is pedal Bb, 1 is Bb, 2 is F, etc.
         """
-        semitones = self.fundamental.get_semitones() - position
-        position_pitch = Pitch.from_semitones(semitones)
-        position_pitch_hertz = position_pitch.get_hertz()
-        position_partial_pitch_hertz = position_pitch_hertz * (partial + 1)
-        position_partial_pitch = Pitch.from_hertz(position_partial_pitch_hertz)
-        return position_partial_pitch
+        return Pitch.from_semitones(self._get_first_position_partial_semitones(partial) - position)
     
     def get_position(self, pitch: Pitch, partial: int):
-        semitones = pitch.get_semitones()
-        first_position_hertz = self.fundamental.get_hertz()
-        first_position_partial_hertz = first_position_hertz * (partial + 1)
-        first_position_partial_pitch = Pitch.from_hertz(first_position_partial_hertz)
-        first_position_partial_semitones = first_position_partial_pitch.get_semitones()
-        return first_position_partial_semitones - semitones
+        return self._get_first_position_partial_semitones(partial) - pitch.get_semitones()
+    
+    def _get_first_position_partial_semitones(self, partial: int):
+        if partial < 0:
+            raise ValueError('partial must not be negative: {}'.format(partial))
+        # the table only covers whole partials, anything else is computed directly
+        if partial < MAX_PARTIAL and partial == int(partial):
+            return self._first_position_partial_semitones[int(partial)]
+        return self._fund_semitones + SEMITONES_PER_OCTAVE * log2(partial + 1)
     
     def get_positions_and_partials(self, pitch: Pitch):
-        positions = []
-        partials = []
-        partial = 0
-        while True:
-            position = self.get_position(pitch, partial)
-            if position > self.slide_length:
-                # partial is too high to play the note
-                break
-            if position > -0.5: # allow flat notes in first position
-                positions.append(position)
-                partials.append(partial)
-            # otherwise, partial is too low to play the note yet
-            partial += 1
-        return positions, partials
+        positions, partials = self._get_position_and_partial_arrays(pitch)
+        return tuple(positions.tolist()), tuple(partials.tolist())
+    
+    def _get_position_and_partial_arrays(self, pitch: Pitch):
+        return _playable_positions_and_partials(self._fund_semitones, self._slide_length, pitch.get_semitones())
     
     def get_length(self, pitch: Pitch, partial: int):
         frequency = pitch.get_hertz() / (partial + 1)
@@ -182,13 +430,29 @@ class Trombone:
         return wavelength * 0.5
     
     def get_slide_length(self, pitch: Pitch, partial: int):
-        fundamental_length = self.get_length(self.fundamental, 0)
-        pitch_length = self.get_length(pitch, partial)
+        fundamental_length = self.get_length(self._fundamental, 0)
+
+        # tube length is inversely proportional to frequency
+        semitones = pitch.get_semitones() - self._fund_semitones
+        pitch_length = fundamental_length * (partial + 1) * exp2(-semitones / SEMITONES_PER_OCTAVE)
 
         # slide has two sides, so divide by two
         return (pitch_length - fundamental_length) / 2
+    
+    def get_slide_lengths(self, pitches: list[Pitch], partial: int):
+        """
+        Returns the slide lengths of a sequence of pitches played on the same partial, as a single array.
+        """
+        fundamental_length = self.get_length(self._fundamental, 0)
+
+        # tube length is inversely proportional to frequency
+        semitones = Pitch.semitones_array(pitches) - self._fund_semitones
+        pitch_lengths = fundamental_length * (partial + 1) * np.exp2(-semitones / SEMITONES_PER_OCTAVE)
 
-    @dataclass(frozen=True)
+        # slide has two sides, so divide by two
+        return (pitch_lengths - fundamental_length) / 2
+
+    @dataclass(frozen=True, slots=True)
     class State:
         id: int
         pitch: Pitch
@@ -196,176 +460,95 @@ class Trombone:
         partial: int
         out: bool = False
     
-    def get_states_of_pitch(self, id: int, pitch: Pitch, out=False):
-        states = []
-        
-        positions, partials = self.get_positions_and_partials(pitch)
-        for position, partial in zip(positions, partials):
-            state = Trombone.State(id, pitch, position, partial, out)
-            states.append(state)
+    @dataclass(frozen=True, slots=True, eq=False)
+    class Layer:
+        """
+        All the states a single pitch can be played in, stored as parallel arrays.
+        """
+        pitch: Pitch
+        positions: np.ndarray
+        partials: np.ndarray
+        outs: np.ndarray
+    
+    def get_layer_of_pitch(self, pitch: Pitch, out=False):
+        positions, partials = self._get_position_and_partial_arrays(pitch)
         
-        if not states:
+        if not len(positions):
             raise ValueError('pitch cannot be played: {}'.format(pitch))
 
-        return states
+        return Trombone.Layer(pitch, positions, partials, np.full(len(positions), out))
     
-    def get_states_of_pitches(self, pitches: list[Pitch], out=False):
-        states = []
-        for id, pitch in enumerate(pitches):
-            states.append(self.get_states_of_pitch(id, pitch, out))
-        return states
+    def get_layers_of_pitches(self, pitches: list[Pitch], out=False):
+        return [self.get_layer_of_pitch(pitch, out) for pitch in pitches]
     
-    def minimize_slide_movement(self, pitches: list[Pitch], round_positions=False):
+    def find_path(self, layers: list[Layer], weight_kind: int, round_positions=False):
         """
-        Returns the list of slide positions that minimizes the amount
-        of slide movement to play a given sequence of pitches.
+        Returns the sequence of states, choosing one state per pitch,
+        that minimizes the total weight of the given kind.
         """
-
-        states = self.get_states_of_pitches(pitches)
-
-        DG = nx.DiGraph()
-        DG.add_node(START_NODE)
-        DG.add_node(END_NODE)
-
-        for first_note_state in states[0]:
-            DG.add_edge(START_NODE, first_note_state, weight=0)
+        counts = np.array([len(layer.positions) for layer in layers])
+        positions = np.zeros((len(layers), counts.max()))
+        partials = np.zeros((len(layers), counts.max()), dtype=np.int64)
+        outs = np.zeros((len(layers), counts.max()), dtype=np.bool_)
+        for id, layer in enumerate(layers):
+            positions[id, :counts[id]] = layer.positions
+            partials[id, :counts[id]] = layer.partials
+            outs[id, :counts[id]] = layer.outs
         
-        for last_note_state in states[-1]:
-            DG.add_edge(last_note_state, END_NODE, weight=0)
-        
-        for id in range(len(states) - 1):
-            curr_states = states[id]
-            next_states = states[id + 1]
-            state_pairs = [p for p in product(curr_states, next_states)]
-            weighted_edges = [(u, v, abs(u.position - v.position)) for u, v in state_pairs]
-            DG.add_weighted_edges_from(weighted_edges)
-        
-        path = nx.shortest_path(DG, START_NODE, END_NODE, weight='weight')
-        path = path[1:-1] # remove start and end node
-        
-        if round_positions:
-            path = [Trombone.State(t.id, t.pitch, round(t.position), t.partial) for t in path]
+        indices = _viterbi(positions, partials, outs, counts, weight_kind)
+
+        path = []
+        for id, (layer, i) in enumerate(zip(layers, indices)):
+            position = float(layer.positions[i])
+            partial = int(layer.partials[i])
+            if round_positions:
+                path.append(Trombone.State(id, layer.pitch, Trombone.round_position(position), partial))
+            else:
+                path.append(Trombone.State(id, layer.pitch, position, partial, bool(layer.outs[i])))
         
         return path
     
+    def minimize_slide_movement(self, pitches: list[Pitch], round_positions=False):
+        """
+        Returns the list of slide positions that minimizes the amount
+        of slide movement to play a given sequence of pitches.
+        """
+        layers = self.get_layers_of_pitches(pitches)
+        return self.find_path(layers, WEIGHT_SLIDE_MOVEMENT, round_positions)
+    
     def minimize_direction_changes(self, pitches: list[Pitch], round_positions=False):
         """
         Returns the list of slide positions that minimizes the
         number of slide direction changes.
         """
-
-        in_states = self.get_states_of_pitches(pitches, out=False)
-        out_states = self.get_states_of_pitches(pitches, out=True)
-
-        DG = nx.DiGraph()
-        DG.add_node(START_NODE)
-        DG.add_node(END_NODE)
-
-        for first_note_state in in_states[0]:
-            DG.add_edge(START_NODE, first_note_state, weight=0)
-        for first_note_state in out_states[0]:
-            DG.add_edge(START_NODE, first_note_state, weight=0)
-        
-        for last_note_state in in_states[-1]:
-            DG.add_edge(last_note_state, END_NODE, weight=0)
-        for last_note_state in out_states[-1]:
-            DG.add_edge(last_note_state, END_NODE, weight=0)
-        
-        for id in range(len(in_states) - 1):
-            curr_in_states = in_states[id]
-            curr_out_states = out_states[id]
-            next_in_states = in_states[id + 1]
-            next_out_states = out_states[id + 1]
-
-            for curr_i, curr_state in enumerate(curr_in_states):
-                for next_i, next_state in enumerate(next_in_states):
-                    if curr_state.position > next_state.position: # position moves in
-                        DG.add_edge(curr_in_states[curr_i], next_in_states[next_i], weight=0) # keep moving in
-                        DG.add_edge(curr_out_states[curr_i], next_in_states[next_i], weight=1) # change direction from out to in
-                    elif curr_state.position < next_state.position: # position moves out
-                        DG.add_edge(curr_out_states[curr_i], next_out_states[next_i], weight=0) # keep moving out
-                        DG.add_edge(curr_in_states[curr_i], next_out_states[next_i], weight=1) # change direction from in to out
-                    else: # same position
-                        DG.add_edge(curr_in_states[curr_i], next_in_states[next_i], weight=0) # does not change direction
-                        DG.add_edge(curr_out_states[curr_i], next_out_states[next_i], weight=0) # does not change direction
-        
-        path = nx.shortest_path(DG, START_NODE, END_NODE, weight='weight')
-        path = path[1:-1] # remove start and end node
-        
-        if round_positions:
-            path = [Trombone.State(t.id, t.pitch, round(t.position), t.partial) for t in path]
-        
-        return path
+        # each pitch has its in states followed by its out states
+        layers = [Trombone.Layer(layer.pitch,
+                                 np.concatenate((layer.positions, layer.positions)),
+                                 np.concatenate((layer.partials, layer.partials)),
+                                 np.concatenate((layer.outs, ~layer.outs)))
+                  for layer in self.get_layers_of_pitches(pitches, out=False)]
+        return self.find_path(layers, WEIGHT_DIRECTION_CHANGES, round_positions)
     
     def minimize_partial_changes(self, pitches: list[Pitch], round_positions=False):
         """
         Returns the list of slide positions that minimizes the
         number of partial changes, to optimize for glissandos
         """
-        states = self.get_states_of_pitches(pitches)
-
-        DG = nx.DiGraph()
-        DG.add_node(START_NODE)
-        DG.add_node(END_NODE)
-
-        for first_note_state in states[0]:
-            DG.add_edge(START_NODE, first_note_state, weight=0)
-        
-        for last_note_state in states[-1]:
-            DG.add_edge(last_note_state, END_NODE, weight=0)
-        
-        for id in range(len(states) - 1):
-            curr_states = states[id]
-            next_states = states[id + 1]
-
-            for curr_state in curr_states:
-                for next_state in next_states:
-                    DG.add_edge(curr_state, next_state, weight=(0 if curr_state.partial == next_state.partial else 1))
-        
-        path = nx.shortest_path(DG, START_NODE, END_NODE, weight='weight')
-        path = path[1:-1] # remove start and end node
-        
-        if round_positions:
-            path = [Trombone.State(t.id, t.pitch, round(t.position), t.partial) for t in path]
-        
-        return path
+        layers = self.get_layers_of_pitches(pitches)
+        return self.find_path(layers, WEIGHT_PARTIAL_CHANGES, round_positions)
     
     def maximize_partial_changes(self, pitches: list[Pitch], round_positions=False):
         """
         Returns the list of slide positions that minimizes the
         number of partial changes, to optimize for natural legato
         """
-        states = self.get_states_of_pitches(pitches)
-
-        DG = nx.DiGraph()
-        DG.add_node(START_NODE)
-        DG.add_node(END_NODE)
-
-        for first_note_state in states[0]:
-            DG.add_edge(START_NODE, first_note_state, weight=0)
-        
-        for last_note_state in states[-1]:
-            DG.add_edge(last_note_state, END_NODE, weight=0)
-        
-        for id in range(len(states) - 1):
-            curr_states = states[id]
-            next_states = states[id + 1]
-
-            for curr_state in curr_states:
-                for next_state in next_states:
-                    DG.add_edge(curr_state, next_state, weight=(1 if curr_state.partial == next_state.partial else 0))
-        
-        path = nx.shortest_path(DG, START_NODE, END_NODE, weight='weight')
-        path = path[1:-1] # remove start and end node
-        
-        if round_positions:
-            path = [Trombone.State(t.id, t.pitch, round(t.position), t.partial) for t in path]
-        
-        return path
+        layers = self.get_layers_of_pitches(pitches)
+        return self.find_path(layers, WEIGHT_PARTIAL_REPEATS, round_positions)
 
 
 def run(args):
-    trombone = Trombone()
+    trombone = Trombone.default()
+    # from_string is memoized, so repeated notes share a single Pitch
     pitches = [Pitch.from_string(note) for note in args.notes]
 
     if args.method == 'distance':
@@ -17,6 +17,66 @@ class TestFromHertz(unittest.TestCase):
         self.assertEqual(Pitch.from_hertz(493).remove_offset(), Pitch(Note.B, 4))
         self.assertEqual(Pitch.from_hertz(523).remove_offset(), Pitch(Note.C, 5))
 
+class TestFromHertzSnap(unittest.TestCase):
+    def runTest(self):
+        self.assertEqual(Pitch.from_hertz(440, snap=True), Pitch(Note.A, 4))
+        self.assertEqual(Pitch.from_hertz(493, snap=True), Pitch(Note.B, 4))
+        self.assertEqual(Pitch.from_hertz(523, snap=True), Pitch(Note.C, 5))
+        self.assertEqual(Pitch.from_hertz(523, snap=True).offset, 0)
+        self.assertNotEqual(Pitch.from_hertz(523).offset, 0)
+        for hertz in [0, -440, float('nan'), float('inf')]:
+            with self.assertRaises(ValueError):
+                Pitch.from_hertz(hertz)
+            with self.assertRaises(ValueError):
+                Pitch.from_hertz(hertz, snap=True)
+
+class TestFromHertzRounded(unittest.TestCase):
+    def runTest(self):
+        self.assertEqual(Pitch.from_hertz_rounded(440), Pitch(Note.A, 4))
+        self.assertEqual(Pitch.from_hertz_rounded(880), Pitch(Note.A, 5))
+        self.assertEqual(Pitch.from_hertz_rounded(220), Pitch(Note.A, 3))
+        self.assertEqual(Pitch.from_hertz_rounded(493), Pitch(Note.B, 4))
+        self.assertEqual(Pitch.from_hertz_rounded(523), Pitch(Note.C, 5))
+        self.assertEqual(Pitch.from_hertz_rounded(845), Pitch(Note.Ab, 5))
+        for hertz in [0, -440, float('nan'), float('inf')]:
+            with self.assertRaises(ValueError):
+                Pitch.from_hertz_rounded(hertz)
+
+class TestPitchImmutable(unittest.TestCase):
+    def runTest(self):
+        pitch = Pitch(Note.A, 4)
+        with self.assertRaises(AttributeError):
+            pitch.octave = 5
+        self.assertEqual(pitch, Pitch(Note.A, 4))
+        self.assertEqual(hash(pitch), hash(Pitch(Note.A, 4)))
+
+class TestGetInterned(unittest.TestCase):
+    def runTest(self):
+        self.assertIs(Pitch.get(Note.C, 4), Pitch.get(Note.C, 4))
+        self.assertEqual(Pitch.get(Note.C, 4), Pitch(Note.C, 4))
+        self.assertIs(Pitch.from_hertz(440).remove_offset(), Pitch.get(Note.A, 4))
+
+class TestSemitonesArray(unittest.TestCase):
+    def runTest(self):
+        pitches = [Pitch(Note.A, 4), Pitch(Note.A, 5), Pitch(Note.C, 5), Pitch(Note.Bb, 1, 0.5)]
+        semitones = Pitch.semitones_array(pitches)
+        self.assertEqual(len(semitones), len(pitches))
+        for pitch, semitone in zip(pitches, semitones):
+            self.assertAlmostEqual(semitone, pitch.get_semitones())
+
+class TestHertzArray(unittest.TestCase):
+    def runTest(self):
+        pitches = [Pitch(Note.A, 4), Pitch(Note.A, 5), Pitch(Note.A, 3), Pitch(Note.B, 4), Pitch(Note.C, 5)]
+        hertz = Pitch.hertz_array(Pitch.semitones_array(pitches))
+        for pitch, frequency in zip(pitches, hertz):
+            self.assertAlmostEqual(frequency, pitch.get_hertz(), places=6)
+
+class TestNoteToString(unittest.TestCase):
+    def runTest(self):
+        self.assertEqual(str(Note.C), 'Note.C')
+        self.assertEqual('{}'.format(Note.Bb), 'Note.Bb')
+        self.assertEqual(Note.A + SEMITONES_PER_OCTAVE, 21)
+
 class TestFromString(unittest.TestCase):
     def runTest(self):
         self.assertEqual(Pitch.from_string('G6'), Pitch(Note.G, 6))
@@ -37,7 +97,7 @@ class TestToString(unittest.TestCase):
 
 class TestGetPitchFirstPosition(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         self.assertEqual(trombone.get_pitch(0, 0), Pitch(Note.Bb, 1))
         self.assertEqual(trombone.get_pitch(0, 1), Pitch(Note.Bb, 2))
         self.assertEqual(trombone.get_pitch(0, 2).remove_offset(), Pitch(Note.F, 3))
@@ -47,7 +107,7 @@ class TestGetPitchFirstPosition(unittest.TestCase):
 
 class TestGetPitchSecondPosition(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         self.assertEqual(trombone.get_pitch(1, 0), Pitch(Note.A, 1))
         self.assertEqual(trombone.get_pitch(1, 1), Pitch(Note.A, 2))
         self.assertEqual(trombone.get_pitch(1, 2).remove_offset(), Pitch(Note.E, 3))
@@ -57,7 +117,7 @@ class TestGetPitchSecondPosition(unittest.TestCase):
 
 class TestGetPitchSeventhPosition(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         self.assertEqual(trombone.get_pitch(6, 0), Pitch(Note.E, 1))
         self.assertEqual(trombone.get_pitch(6, 1), Pitch(Note.E, 2))
         self.assertEqual(trombone.get_pitch(6, 2).remove_offset(), Pitch(Note.B, 2))
@@ -67,23 +127,49 @@ class TestGetPitchSeventhPosition(unittest.TestCase):
 
 class TestGetPosition(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         self.assertEqual(trombone.get_position(Pitch(Note.Bb, 2), 1), 0)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.F, 3), 2), 0, places=1)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.C, 3), 2), 5, places=1)
 
 class TestAlternatePositions(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.D, 4), 4), 0, places=0)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.D, 4), 5), 3, places=0)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.F, 4), 5), 0, places=0)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.F, 4), 6), 3, places=0)
         self.assertAlmostEqual(trombone.get_position(Pitch(Note.F, 4), 7), 5, places=0)
 
+class TestHighPartials(unittest.TestCase):
+    def runTest(self):
+        trombone = Trombone.default()
+        self.assertAlmostEqual(trombone.get_position(Pitch(Note.Bb, 6), 31), 0, places=0)
+        self.assertAlmostEqual(trombone.get_position(Pitch(Note.Bb, 6), 32), 0.53, places=2)
+        self.assertEqual(trombone.get_pitch(0, 63), Pitch(Note.Bb, 7))
+        self.assertEqual(trombone.get_pitch(0, 40).remove_offset(), Pitch(Note.D, 7))
+        self.assertEqual(trombone.get_pitch(0, 2.0), trombone.get_pitch(0, 2))
+        self.assertEqual(trombone.get_position(Pitch(Note.F, 4), 5.0), trombone.get_position(Pitch(Note.F, 4), 5))
+        self.assertAlmostEqual(trombone.get_position(Pitch(Note.F, 4), 5.5) - trombone.get_position(Pitch(Note.F, 4), 5), 12 * log2(6.5 / 6))
+
+        positions, partials = trombone.get_positions_and_partials(Pitch(Note.Bb, 6))
+        self.assertGreater(max(partials), 32)
+        for position, partial in zip(positions, partials):
+            self.assertAlmostEqual(trombone.get_position(Pitch(Note.Bb, 6), partial), position)
+
+class TestNegativePartial(unittest.TestCase):
+    def runTest(self):
+        trombone = Trombone.default()
+        with self.assertRaises(ValueError):
+            trombone.get_pitch(0, -1)
+        with self.assertRaises(ValueError):
+            trombone.get_position(Pitch(Note.Bb, 2), -1)
+        with self.assertRaises(ValueError):
+            trombone.get_pitch(0, -0.5)
+
 class TestGetAllPositions(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         positions, partials = trombone.get_positions_and_partials(Pitch(Note.D, 4))
         self.assertEqual(len(positions), 3)
         self.assertAlmostEqual(positions[0], 0, places=0)
@@ -94,16 +180,53 @@ class TestGetAllPositions(unittest.TestCase):
         self.assertEqual(partials[1], 5)
         self.assertEqual(partials[2], 6)
 
+class TestLayerIdentity(unittest.TestCase):
+    def runTest(self):
+        trombone = Trombone.default()
+        layer = trombone.get_layer_of_pitch(Pitch(Note.D, 4))
+        other = trombone.get_layer_of_pitch(Pitch(Note.D, 4))
+        self.assertEqual(layer, layer)
+        self.assertNotEqual(layer, other)
+        self.assertEqual(len({layer, other}), 2)
+
+class TestDefault(unittest.TestCase):
+    def runTest(self):
+        self.assertIs(Trombone.default(), Trombone.default())
+        self.assertEqual(Trombone.default().fundamental, TROMBONE_FUNDAMENTAL)
+        self.assertEqual(Trombone.default().slide_length, TROMBONE_SLIDE_LENGTH)
+        with self.assertRaises(AttributeError):
+            Trombone.default().slide_length = 3
+
+        class BassTrombone(Trombone):
+            pass
+
+        self.assertIs(type(BassTrombone.default()), BassTrombone)
+        self.assertIs(BassTrombone.default(), BassTrombone.default())
+        self.assertIs(type(Trombone.default()), Trombone)
+
 class TestPositionToString(unittest.TestCase):
     def runTest(self):
         self.assertEqual(Trombone.position_to_string(0), '1st')
         self.assertEqual(Trombone.position_to_string(0.2), '1st+0.2')
         self.assertEqual(Trombone.position_to_string(-0.2), '1st-0.2')
         self.assertEqual(Trombone.position_to_string(5.2), '6th+0.2')
+        self.assertEqual(Trombone.position_to_string(6.5), '7th+0.5')
+
+class TestRoundPositionSeventh(unittest.TestCase):
+    def runTest(self):
+        trombone = Trombone.default()
+        pitches = [Pitch(Note.E, 2, -0.5)]
+        path = trombone.minimize_slide_movement(pitches)
+        self.assertAlmostEqual(path[0].position, 6.5)
+
+        path = trombone.minimize_slide_movement(pitches, round_positions=True)
+        self.assertEqual(path[0].position, 6)
+        self.assertEqual(Trombone.round_position(2.5), 3)
+        self.assertEqual(Trombone.round_position(6.5), 6)
 
 class TestMinimizeSlideMovement(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 3),
             Pitch(Note.F, 3),
@@ -118,7 +241,7 @@ class TestMinimizeSlideMovement(unittest.TestCase):
 
 class TestMinimizeSlideMovementScale(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 3),
             Pitch(Note.D, 3),
@@ -137,7 +260,7 @@ class TestMinimizeSlideMovementScale(unittest.TestCase):
 
 class TestMinimizeDirectionChanges(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 4),
             Pitch(Note.D, 4),
@@ -152,7 +275,7 @@ class TestMinimizeDirectionChanges(unittest.TestCase):
 
 class TestMinimizeDirectionChangesComplicated(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.F, 3),
             Pitch(Note.A, 3),
@@ -170,7 +293,7 @@ class TestMinimizeDirectionChangesComplicated(unittest.TestCase):
 
 class TestMinimizeDirectionChangesScale(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 3),
             Pitch(Note.D, 3),
@@ -196,7 +319,7 @@ class TestMinimizeDirectionChangesScale(unittest.TestCase):
 
 class TestMinimizePartialChanges(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 4),
             Pitch(Note.F, 4),
@@ -210,7 +333,7 @@ class TestMinimizePartialChanges(unittest.TestCase):
 
 class TestMinimizePartialChangesScale(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 3),
             Pitch(Note.D, 3),
@@ -236,7 +359,7 @@ class TestMinimizePartialChangesScale(unittest.TestCase):
 
 class TestMaximizePartialChanges(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 4),
             Pitch(Note.F, 4),
@@ -250,7 +373,7 @@ class TestMaximizePartialChanges(unittest.TestCase):
 
 class TestMaximizePartialChangesScale(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.C, 3),
             Pitch(Note.D, 3),
@@ -276,7 +399,7 @@ class TestMaximizePartialChangesScale(unittest.TestCase):
 
 class TestGetLength(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         length_Bb1 = trombone.get_length(Pitch(Note.Bb, 2), 1)
         length_Bb2 = trombone.get_length(Pitch(Note.Bb, 3), 3)
 
@@ -285,7 +408,7 @@ class TestGetLength(unittest.TestCase):
 
 class TestGetSlideLength(unittest.TestCase):
     def runTest(self):
-        trombone = Trombone()
+        trombone = Trombone.default()
         pitches = [
             Pitch(Note.Bb, 2),
             Pitch(Note.A, 2),
@@ -302,6 +425,18 @@ class TestGetSlideLength(unittest.TestCase):
             distance_ratio = (slide_lengths[i + 2] - slide_lengths[i + 1]) / (slide_lengths[i + 1] - slide_lengths[i])
             self.assertAlmostEqual(distance_ratio, 1.06, places=2)
 
+class TestGetSlideLengths(unittest.TestCase):
+    def runTest(self):
+        trombone = Trombone.default()
+        pitches = [Pitch(Note.Bb, 2), Pitch(Note.F, 2), Pitch(Note.E, 2), Pitch(Note.F, 3)]
+        slide_lengths = trombone.get_slide_lengths(pitches, 1)
+
+        self.assertEqual(len(slide_lengths), len(pitches))
+        self.assertAlmostEqual(slide_lengths[0], 0)
+        for pitch, slide_length in zip(pitches, slide_lengths):
+            expected = (trombone.get_length(pitch, 1) - trombone.get_length(trombone.fundamental, 0)) / 2
+            self.assertAlmostEqual(slide_length, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file